@@ -0,0 +1,218 @@
+"""
+Reachability-preserving obstacle placement.
+
+The board is treated as a grid of cells (the positions a snake head can
+occupy). Snakes move between 4-adjacent free cells. Blocked cells are
+tracked with a union-find over 8-adjacency, where everything outside the
+board is a single extra "border" node.
+
+Blocking a single cell splits a free region exactly when that cell joins
+two separate groups of blocked cells around it that already belong to the
+same blocked component: the new cell closes a loop, and the free cells on
+either side of it end up inside and outside that loop. So each cell of a
+candidate obstacle is validated with a few union-find lookups instead of
+flood-filling the board.
+
+A whole obstacle is checked one cell at a time along the line, which is
+conservative: it never accepts an obstacle that cuts off part of the
+board, but it rejects one whose early cells close a pocket that its later
+cells would fill.
+
+Unions are made without path compression so that a rejected candidate can
+be rolled back; union by size keeps finds logarithmic.
+"""
+import math
+
+from geometry import midpoint_line
+
+# 8-neighbourhood in circular order: N, NE, E, SE, S, SW, W, NW.
+# Even positions are the 4-adjacent ("edge") neighbours.
+RING = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+EDGES = (0, 2, 4, 6)
+
+
+class FreeSpace:
+    """
+    Blocked/free state of a cols x rows grid with incremental
+    connectivity of the blocked cells.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        n = cols * rows
+        self._border = n
+        self._blocked = bytearray(n)
+        self._parent = list(range(n + 1))
+        self._size = [1] * (n + 1)
+        self._trail = None   # Unions made by the candidate being placed
+
+    def is_blocked(self, i, j):
+        """
+        Cells outside the grid count as blocked.
+        """
+        if not (0 <= i < self.cols and 0 <= j < self.rows):
+            return True
+        return self._blocked[j * self.cols + i] != 0
+
+    def _find(self, a):
+        parent = self._parent
+        while parent[a] != a:
+            a = parent[a]
+        return a
+
+    def _union(self, a, b):
+        a = self._find(a)
+        b = self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        if self._trail is not None:
+            self._trail.append((b, a))
+
+    def _ring(self, i, j):
+        """
+        Union-find node of each blocked neighbour in RING order, None for
+        free neighbours.
+        """
+        nodes = []
+        for di, dj in RING:
+            x, y = i + di, j + dj
+            if not (0 <= x < self.cols and 0 <= y < self.rows):
+                nodes.append(self._border)
+            elif self._blocked[y * self.cols + x]:
+                nodes.append(y * self.cols + x)
+            else:
+                nodes.append(None)
+        return nodes
+
+    def splits(self, i, j):
+        """
+        Returns True if blocking free cell (i, j) would cut a free region
+        in two.
+        """
+        ring = self._ring(i, j)
+        free_edges = [k for k in EDGES if ring[k] is None]
+        if len(free_edges) < 2:
+            return False
+
+        # Blocked neighbours between two consecutive free edges touch each
+        # other, so each such stretch is one group. Two groups in the same
+        # component means the cell closes a loop.
+        roots = set()
+        for a, b in zip(free_edges, free_edges[1:] + [free_edges[0] + 8]):
+            for k in range(a + 1, b):
+                node = ring[k % 8]
+                if node is not None:
+                    root = self._find(node)
+                    if root in roots:
+                        return True
+                    roots.add(root)
+                    break
+        return False
+
+    def region(self, start):
+        """
+        Returns the free cells 4-connected to `start`, empty if `start`
+        itself is blocked. Blocking cells with try_block() only ever
+        removes cells from a region, it never splits one.
+        """
+        if self.is_blocked(*start):
+            return set()
+        seen = {start}
+        stack = [start]
+        while stack:
+            i, j = stack.pop()
+            for n in ((i + 1, j), (i - 1, j), (i, j + 1), (i, j - 1)):
+                if n not in seen and not self.is_blocked(*n):
+                    seen.add(n)
+                    stack.append(n)
+        return seen
+
+    def _block(self, i, j):
+        index = j * self.cols + i
+        ring = self._ring(i, j)
+        self._blocked[index] = 1
+        for node in ring:
+            if node is not None:
+                self._union(index, node)
+
+    def block(self, cells):
+        """
+        Blocks cells unconditionally, e.g. obstacles that are already on
+        the board.
+        """
+        for (i, j) in cells:
+            if not self.is_blocked(i, j):
+                self._block(i, j)
+
+    def try_block(self, cells, protected=()):
+        """
+        Blocks `cells` only if no free region gets split and none of the
+        `protected` cells (heads, food) would be covered. Returns whether
+        the cells were blocked; on failure nothing changes.
+
+        Cells are checked in the given order, so the result is conservative
+        (see the module docstring). Ordering them along the obstacle, so
+        that each one touches the ones before it, keeps false rejections
+        rare.
+        """
+        new = [c for c in cells if not self.is_blocked(*c)]
+        if any(c in protected for c in new):
+            return False
+
+        self._trail = []
+        placed = []
+        try:
+            for (i, j) in new:
+                if self.splits(i, j):
+                    for (pi, pj) in placed:
+                        self._blocked[pj * self.cols + pi] = 0
+                    for (child, root) in reversed(self._trail):
+                        self._parent[child] = child
+                        self._size[root] -= self._size[child]
+                    return False
+                self._block(i, j)
+                placed.append((i, j))
+            return True
+        finally:
+            self._trail = None
+
+
+def line_cells(line, radius, cell, cols, rows):
+    """
+    Grid cells whose position lies within `radius` of the line's midpoint
+    points, ordered along the line. Axis-aligned lines (the only kind
+    generate_obstacle() makes) are handled without rasterising them.
+    """
+    x1, y1, x2, y2 = line
+    cells = set()
+
+    def add_span(across, lo, hi, horizontal):
+        # Cells at positions lo..hi along the line, `across` is the other index
+        for c in range(max(-(-lo // cell), 0), min(hi // cell, (cols if horizontal else rows) - 1) + 1):
+            cells.add((c, across) if horizontal else (across, c))
+
+    if y1 == y2 or x1 == x2:
+        horizontal = y1 == y2
+        fixed = y1 if horizontal else x1
+        lo, hi = (min(x1, x2), max(x1, x2)) if horizontal else (min(y1, y2), max(y1, y2))
+        limit = rows if horizontal else cols
+        for c in range(max(-(-(fixed - radius) // cell), 0), min((fixed + radius) // cell, limit - 1) + 1):
+            w = math.isqrt(radius * radius - (c * cell - fixed) ** 2)
+            add_span(c, lo - w, hi + w, horizontal)
+    else:
+        r2 = radius * radius
+        for (px, py) in midpoint_line(x1, y1, x2, y2):
+            for i in range(max(-(-(px - radius) // cell), 0), min((px + radius) // cell, cols - 1) + 1):
+                for j in range(max(-(-(py - radius) // cell), 0), min((py + radius) // cell, rows - 1) + 1):
+                    if (i * cell - px) ** 2 + (j * cell - py) ** 2 <= r2:
+                        cells.add((i, j))
+
+    # Sort along the line, then across it
+    dx, dy = x2 - x1, y2 - y1
+    return sorted(cells, key=lambda c: ((c[0] * cell - x1) * dx + (c[1] * cell - y1) * dy,
+                                        (c[0] * cell - x1) * dy - (c[1] * cell - y1) * dx))
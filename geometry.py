@@ -0,0 +1,81 @@
+"""
+Midpoint line helpers shared by the game and the headless tools
+(level compiler, bots, analytics). No OpenGL imports here.
+"""
+
+# -------------------------------------------------------------------------
+# MIDPOINT LINE HELPER FUNCTIONS
+# -------------------------------------------------------------------------
+def get_zone(x1, y1, x2, y2):
+    dx = x2 - x1
+    dy = y2 - y1
+    
+    if dx >= 0 and dy >= 0:
+        if abs(dx) >= abs(dy):
+            return 0
+        return 1
+    elif dx < 0 and dy >= 0:
+        if abs(dx) >= abs(dy):
+            return 3
+        return 2
+    elif dx < 0 and dy < 0:
+        if abs(dx) >= abs(dy):
+            return 4
+        return 5
+    else:  # dx >= 0 and dy < 0
+        if abs(dx) >= abs(dy):
+            return 7
+        return 6
+
+def convert_to_zone0(x, y, zone):
+    if zone == 0: return (x, y)
+    elif zone == 1: return (y, x)
+    elif zone == 2: return (y, -x)
+    elif zone == 3: return (-x, y)
+    elif zone == 4: return (-x, -y)
+    elif zone == 5: return (-y, -x)
+    elif zone == 6: return (-y, x)
+    elif zone == 7: return (x, -y)
+
+def convert_from_zone0(x, y, zone):
+    if zone == 0: return (x, y)
+    elif zone == 1: return (y, x)
+    elif zone == 2: return (-y, x)
+    elif zone == 3: return (-x, y)
+    elif zone == 4: return (-x, -y)
+    elif zone == 5: return (-y, -x)
+    elif zone == 6: return (y, -x)
+    elif zone == 7: return (x, -y)
+
+def midpoint_line(x1, y1, x2, y2):
+    """
+    Draws a line using the Midpoint (Bresenham) line algorithm.
+    Returns a list of all (x,y) points on the line (for collision checks).
+    """
+    points = []
+    zone = get_zone(x1, y1, x2, y2)
+    
+    x1_z0, y1_z0 = convert_to_zone0(x1, y1, zone)
+    x2_z0, y2_z0 = convert_to_zone0(x2, y2, zone)
+    
+    dx = x2_z0 - x1_z0
+    dy = y2_z0 - y1_z0
+    d = 2 * dy - dx
+    d_E = 2 * dy
+    d_NE = 2 * (dy - dx)
+    
+    x = x1_z0
+    y = y1_z0
+    
+    while x <= x2_z0:
+        orig_x, orig_y = convert_from_zone0(x, y, zone)
+        points.append((orig_x, orig_y))
+        
+        if d <= 0:
+            d += d_E
+        else:
+            y += 1
+            d += d_NE
+        x += 1
+    
+    return points
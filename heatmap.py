@@ -0,0 +1,205 @@
+"""
+Positional heatmaps over many games.
+
+Games run with --events write one event per line. Heads are logged once
+per tick for snakes still alive after the collision check. Events are
+only written once their tick can't be rewound over any more, so a log
+holds the timeline that was actually played, never a discarded one:
+
+    head 40 40
+    food 120 300
+    death 800 40 hit boundary
+
+Events are consumed as a stream and binned per grid cell into fixed-size
+NumPy arrays with bincount, one channel per event type, so memory stays
+constant no matter how many games are processed. Each worker produces a
+partial Heatmap and the partials are merged by addition.
+
+    python heatmap.py events/*.log --out heatmaps --workers 8
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+CHANNELS = ('head', 'food', 'death_boundary', 'death_self',
+            'obstacle_hit', 'death_collision', 'death_other')
+CHANNEL_INDEX = {name: i for i, name in enumerate(CHANNELS)}
+
+# Death reasons as passed to kill_snake1()/kill_snake2()
+DEATH_CHANNELS = {
+    'hit boundary': 'death_boundary',
+    'bit itself': 'death_self',
+    'touched obstacle': 'obstacle_hit',
+    'collided with Snake 1': 'death_collision',
+    'collided with Snake 2': 'death_collision',
+}
+
+CHUNK_SIZE = 1 << 16   # Events binned per bincount call
+
+# -------------------------------------------------------------------------
+# EVENT STREAMS
+# -------------------------------------------------------------------------
+def read_events(path):
+    """
+    Yields (kind, x, y, reason) tuples from an event log, one line at a time.
+    """
+    with open(path) as f:
+        for line in f:
+            parts = line.split(None, 3)
+            if len(parts) < 3:
+                continue
+            reason = parts[3].strip() if len(parts) > 3 else None
+            yield parts[0], int(parts[1]), int(parts[2]), reason
+
+def event_channel(kind, reason):
+    """
+    Returns the channel name an event is counted in, or None to skip it.
+    """
+    if kind == 'death':
+        return DEATH_CHANNELS.get(reason, 'death_other')
+    if kind in CHANNEL_INDEX:
+        return kind
+    return None
+
+# -------------------------------------------------------------------------
+# ACCUMULATION
+# -------------------------------------------------------------------------
+class Heatmap:
+    """
+    Per-cell event counts, shape (len(CHANNELS), rows, cols).
+    """
+
+    def __init__(self, width=800, height=600, cell=10):
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.cols = width // cell
+        self.rows = height // cell
+        self.counts = np.zeros((len(CHANNELS), self.rows, self.cols), dtype=np.int64)
+
+    def _flat_indices(self, events):
+        ncells = self.rows * self.cols
+        last_col, last_row = self.cols - 1, self.rows - 1
+        for kind, x, y, reason in events:
+            channel = event_channel(kind, reason)
+            if channel is None:
+                continue
+            # Boundary deaths happen just off the board; count them on the
+            # nearest edge cell
+            col = min(max(x // self.cell, 0), last_col)
+            row = min(max(y // self.cell, 0), last_row)
+            yield CHANNEL_INDEX[channel] * ncells + row * self.cols + col
+
+    def consume(self, events):
+        """
+        Adds an iterable of (kind, x, y, reason) events, CHUNK_SIZE at a time.
+        """
+        size = self.counts.size
+        flat = self.counts.reshape(-1)
+        indices = self._flat_indices(events)
+        while True:
+            chunk = np.fromiter(islice(indices, CHUNK_SIZE), dtype=np.int64, count=-1)
+            if chunk.size == 0:
+                break
+            flat += np.bincount(chunk, minlength=size)
+        return self
+
+    def merge(self, other):
+        """
+        Adds another Heatmap's counts into this one.
+        """
+        if other.counts.shape != self.counts.shape:
+            raise ValueError("cannot merge heatmaps with different grids")
+        self.counts += other.counts
+        return self
+
+    def channel(self, name):
+        return self.counts[CHANNEL_INDEX[name]]
+
+    def deaths(self):
+        """
+        All deaths regardless of reason.
+        """
+        return self.counts[CHANNEL_INDEX['death_boundary']:].sum(axis=0)
+
+def _accumulate_file(args):
+    path, width, height, cell = args
+    return Heatmap(width, height, cell).consume(read_events(path)).counts
+
+def accumulate_files(paths, width=800, height=600, cell=10, workers=None):
+    """
+    Builds one Heatmap from many event logs, one log per task on a
+    process pool. Partial results are merged as they arrive.
+    """
+    total = Heatmap(width, height, cell)
+    tasks = ((p, width, height, cell) for p in paths)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for counts in pool.map(_accumulate_file, tasks):
+            total.counts += counts
+    return total
+
+# -------------------------------------------------------------------------
+# RENDERING
+# -------------------------------------------------------------------------
+def to_rgb(grid, scale):
+    """
+    Maps counts to a black-red-yellow-white ramp on a log scale, scaled up
+    by `scale` pixels per cell. Row 0 is the bottom of the board, so the
+    image is flipped to match the game's view.
+    """
+    values = np.log1p(grid.astype(np.float64))
+    peak = values.max()
+    t = values / peak if peak > 0 else values
+    rgb = np.stack([np.clip(3 * t, 0, 1),
+                    np.clip(3 * t - 1, 0, 1),
+                    np.clip(3 * t - 2, 0, 1)], axis=-1)
+    rgb = (rgb * 255).astype(np.uint8)[::-1]
+    return rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+
+def write_ppm(path, rgb):
+    """
+    Writes an RGB array as a binary PPM image (no imaging library needed).
+    """
+    h, w, _ = rgb.shape
+    with open(path, 'wb') as f:
+        f.write(f"P6 {w} {h} 255\n".encode('ascii'))
+        f.write(np.ascontiguousarray(rgb).tobytes())
+
+def render(heatmap, out_dir, scale=None):
+    """
+    Writes one image per channel plus one for all deaths.
+    Returns the paths written.
+    """
+    scale = scale or heatmap.cell
+    os.makedirs(out_dir, exist_ok=True)
+    grids = [(name, heatmap.channel(name)) for name in CHANNELS]
+    grids.append(('deaths', heatmap.deaths()))
+
+    paths = []
+    for name, grid in grids:
+        path = os.path.join(out_dir, f"{name}.ppm")
+        write_ppm(path, to_rgb(grid, scale))
+        paths.append(path)
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build heatmaps from snake event logs.")
+    parser.add_argument("logs", nargs="+", help="event logs written with --events")
+    parser.add_argument("--out", default="heatmaps", help="output directory")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--save", help="also save the raw counts to this .npy file")
+    args = parser.parse_args(argv)
+
+    heatmap = accumulate_files(args.logs, workers=args.workers)
+    for name in CHANNELS:
+        print(f"{name:<16} {heatmap.channel(name).sum()}")
+    if args.save:
+        np.save(args.save, heatmap.counts)
+    for path in render(heatmap, args.out):
+        print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
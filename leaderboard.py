@@ -0,0 +1,244 @@
+"""
+Persistent game results and leaderboard queries.
+
+Results go into a local SQLite database in WAL mode. Producers only put
+results on a queue; a background thread drains it and writes whole batches
+in one transaction, so ending a game (or millions of headless games) never
+waits on the disk. Readers use their own connection and, thanks to WAL,
+aren't blocked by the writer.
+
+Print the leaderboard from the command line with:
+
+    python leaderboard.py snake_scores.db [--player "Snake 1"] [-n 10]
+"""
+import argparse
+import os
+import pathlib
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+
+# One finished game. `players`, `scores` and `deaths` have one entry per
+# snake that took part; `winner` is the winning player's index or None
+# for a tie. `finished_at` is a time.time() timestamp.
+GameResult = namedtuple('GameResult',
+                        'mode players scores winner duration_ms deaths seed finished_at')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    played_at   REAL NOT NULL,
+    mode        TEXT NOT NULL,
+    winner      TEXT,
+    duration_ms INTEGER NOT NULL,
+    seed        INTEGER
+);
+CREATE TABLE IF NOT EXISTS game_players (
+    game_id      INTEGER NOT NULL REFERENCES games(id),
+    slot         INTEGER NOT NULL,
+    player       TEXT NOT NULL,
+    score        INTEGER NOT NULL,
+    death_reason TEXT,
+    PRIMARY KEY (game_id, slot)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS game_players_score
+    ON game_players (score DESC);
+CREATE INDEX IF NOT EXISTS game_players_player_score
+    ON game_players (player, score DESC);
+"""
+
+BATCH_SIZE = 5000   # Most results written per transaction
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, much faster
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def connect_readonly(path):
+    """
+    Opens an existing results database for queries only; nothing is
+    created if it is missing.
+    """
+    uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def top_scores(conn, n=10, player=None):
+    """
+    Returns the n best (player, score, mode, played_at) rows, optionally
+    for a single player.
+    """
+    sql = ("SELECT p.player, p.score, g.mode, g.played_at "
+           "FROM game_players p JOIN games g ON g.id = p.game_id ")
+    if player is None:
+        sql += "ORDER BY p.score DESC LIMIT ?"
+        args = (n,)
+    else:
+        sql += "WHERE p.player = ? ORDER BY p.score DESC LIMIT ?"
+        args = (player, n)
+    return conn.execute(sql, args).fetchall()
+
+
+def player_stats(conn, player):
+    """
+    Returns (games, wins, best score, average score) for a player.
+    """
+    return conn.execute(
+        "SELECT count(*), "
+        "       sum(g.winner IS p.player), "
+        "       max(p.score), "
+        "       avg(p.score) "
+        "FROM game_players p JOIN games g ON g.id = p.game_id "
+        "WHERE p.player = ?", (player,)).fetchone()
+
+
+class ResultStore:
+    """
+    Queues game results and writes them from a background thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Create the schema up front so a bad path fails in the caller
+        conn = _connect(path)
+        with conn:
+            conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue = queue.SimpleQueue()
+        self._reader = None
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name="ResultStore writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, result):
+        """
+        Queues a GameResult. Never blocks on the database.
+        """
+        self._queue.put(result)
+
+    def flush(self, timeout=None):
+        """
+        Waits until everything submitted so far has been committed.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """
+        Writes any queued results and stops the writer thread.
+        """
+        self._queue.put(None)
+        self._writer.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            results = []
+            waiters = []
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    results.append(item)
+
+            if results:
+                try:
+                    self._insert(conn, results)
+                except sqlite3.Error as e:
+                    print(f"Could not save {len(results)} game results: {e}", file=sys.stderr)
+            for w in waiters:
+                w.set()
+        conn.close()
+
+    @staticmethod
+    def _insert(conn, results):
+        rows = []
+        with conn:
+            cur = conn.cursor()
+            for r in results:
+                winner = r.players[r.winner] if r.winner is not None else None
+                cur.execute(
+                    "INSERT INTO games (played_at, mode, winner, duration_ms, seed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (r.finished_at, r.mode, winner, r.duration_ms, r.seed))
+                game_id = cur.lastrowid
+                for slot, (player, score, death) in enumerate(zip(r.players, r.scores, r.deaths)):
+                    rows.append((game_id, slot, player, score, death))
+            cur.executemany(
+                "INSERT INTO game_players (game_id, slot, player, score, death_reason) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    # ---------------------------------------------------------------------
+    # QUERIES
+    # ---------------------------------------------------------------------
+    def _read_conn(self):
+        if self._reader is None:
+            self._reader = _connect(self.path)
+        return self._reader
+
+    def top_scores(self, n=10, player=None):
+        """
+        See top_scores(). Results still in the queue aren't included.
+        """
+        return top_scores(self._read_conn(), n, player)
+
+    def player_stats(self, player):
+        """
+        See player_stats().
+        """
+        return player_stats(self._read_conn(), player)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the snake leaderboard.")
+    parser.add_argument("database", help="results database written by the game")
+    parser.add_argument("--player", help="only show this player's games")
+    parser.add_argument("-n", type=int, default=10, help="number of rows")
+    args = parser.parse_args(argv)
+
+    # Only read: don't create a database or start a writer for this
+    if not os.path.exists(args.database):
+        sys.exit(f"{args.database}: no such results database")
+    try:
+        conn = connect_readonly(args.database)
+        try:
+            rows = top_scores(conn, args.n, args.player)
+            stats = player_stats(conn, args.player) if args.player else None
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        sys.exit(f"{args.database}: {e}")
+
+    for rank, (player, score, mode, played_at) in enumerate(rows, 1):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(played_at))
+        print(f"{rank:3}. {player:<16} {score:5}  {mode:<6} {when}")
+    if stats and stats[0]:
+        games, wins, best, avg = stats
+        print(f"{args.player}: {games} games, {wins} wins, best {best}, average {avg:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Precompiled level packs.
+
+A level pack is a small binary file holding predefined obstacle segments,
+spawn points and a collision bitmap that is already dilated by the snake
+radius. The game maps the file with mmap, so opening a pack only parses the
+fixed-size header: segments are decoded lazily and collision checks read a
+single byte straight out of the mapping.
+
+Compile a pack from a text description with:
+
+    python levels.py my_level.txt my_level.lvl
+
+Text format (one directive per line, '#' starts a comment):
+
+    size 800 600
+    radius 5
+    spawn 40 40
+    spawn 760 560
+    line 100 300 700 300
+"""
+import argparse
+import math
+import mmap
+import struct
+import sys
+
+from geometry import midpoint_line
+
+# -------------------------------------------------------------------------
+# FILE LAYOUT
+# -------------------------------------------------------------------------
+# Header: magic, version, width, height, radius, segment count, spawn count,
+# segment table offset, bitmap offset. Segments are four int32 each
+# (x1, y1, x2, y2), spawns two int32 each and follow the segments directly.
+# The bitmap holds one byte per pixel, row-major, non-zero means "blocked".
+MAGIC = b"SNAKELVL"
+VERSION = 1
+HEADER = struct.Struct("<8s8I")
+SEGMENT = struct.Struct("<4i")
+SPAWN = struct.Struct("<2i")
+
+DEFAULT_WIDTH, DEFAULT_HEIGHT = 800, 600
+DEFAULT_RADIUS = 5
+GRID_SIZE = 10   # Snakes move and food spawns on multiples of this
+
+# -------------------------------------------------------------------------
+# LOADING
+# -------------------------------------------------------------------------
+class LevelPack:
+    """
+    A memory-mapped level pack. Opening one costs the same no matter how
+    many obstacles the level contains.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, self.width, self.height, self.radius,
+             self.segment_count, spawn_count,
+             segments_offset, bitmap_offset) = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a level pack")
+            if version != VERSION:
+                raise ValueError(f"{path}: unsupported level pack version {version}")
+            spawns_offset = segments_offset + self.segment_count * SEGMENT.size
+            if (segments_offset < HEADER.size or
+                    spawns_offset + spawn_count * SPAWN.size > bitmap_offset or
+                    bitmap_offset + self.width * self.height > len(self._mm)):
+                raise ValueError(f"{path}: truncated level pack")
+            self.spawns = [SPAWN.unpack_from(self._mm, spawns_offset + i * SPAWN.size)
+                           for i in range(spawn_count)]
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"{path}: truncated level pack") from None
+        except ValueError:
+            self._mm.close()
+            raise
+
+        self._segments_offset = segments_offset
+        self._bitmap_offset = bitmap_offset
+
+    def segments(self):
+        """
+        Yields the obstacle segments as (x1, y1, x2, y2) tuples, decoded
+        on demand from the mapping.
+        """
+        end = self._segments_offset + self.segment_count * SEGMENT.size
+        view = memoryview(self._mm)[self._segments_offset:end]
+        try:
+            yield from SEGMENT.iter_unpack(view)
+        finally:
+            view.release()
+
+    def blocked(self, x, y):
+        """
+        Returns True if pixel (x, y) lies within the compiled radius of an
+        obstacle. Points outside the level are never blocked.
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return self._mm[self._bitmap_offset + y * self.width + x] != 0
+
+    def close(self):
+        self._mm.close()
+
+# -------------------------------------------------------------------------
+# COMPILING
+# -------------------------------------------------------------------------
+def parse_level(text):
+    """
+    Parses a text level description.
+    Returns (width, height, radius, segments, spawns).
+    """
+    width, height, radius = DEFAULT_WIDTH, DEFAULT_HEIGHT, DEFAULT_RADIUS
+    segments = []
+    spawns = []
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        keyword, *args = line.split()
+        expected = {"size": 2, "radius": 1, "spawn": 2, "line": 4}.get(keyword)
+        if expected is None:
+            raise ValueError(f"line {lineno}: unknown directive '{keyword}'")
+        if len(args) != expected:
+            raise ValueError(f"line {lineno}: '{keyword}' takes {expected} values")
+        try:
+            values = [int(a) for a in args]
+        except ValueError:
+            raise ValueError(f"line {lineno}: expected integers") from None
+
+        if keyword == "size":
+            width, height = values
+        elif keyword == "radius":
+            radius, = values
+        elif keyword == "spawn":
+            spawns.append(tuple(values))
+        else:
+            segments.append(tuple(values))
+
+    if width <= 0 or height <= 0 or radius < 0:
+        raise ValueError("size must be positive and radius non-negative")
+    for (x1, y1, x2, y2) in segments:
+        if not (0 <= min(x1, x2) and max(x1, x2) < width and
+                0 <= min(y1, y2) and max(y1, y2) < height):
+            raise ValueError(f"segment {(x1, y1, x2, y2)} is outside the level")
+    for (x, y) in spawns:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"spawn {(x, y)} is outside the level")
+        if x % GRID_SIZE or y % GRID_SIZE:
+            raise ValueError(f"spawn {(x, y)} is not on the {GRID_SIZE}-pixel grid")
+
+    return width, height, radius, segments, spawns
+
+def _fill_span(bitmap, width, y, x1, x2):
+    x1 = max(x1, 0)
+    x2 = min(x2, width - 1)
+    if x1 <= x2:
+        row = y * width
+        bitmap[row + x1:row + x2 + 1] = b"\x01" * (x2 - x1 + 1)
+
+def dilate_segment(bitmap, width, height, segment, radius):
+    """
+    Marks every pixel within `radius` of the segment's midpoint-line points.
+    Axis-aligned segments are filled one row span at a time; anything else
+    falls back to stamping a disc per point.
+    """
+    x1, y1, x2, y2 = segment
+    half_widths = [math.isqrt(radius*radius - dy*dy) for dy in range(radius + 1)]
+
+    if y1 == y2:
+        lo, hi = min(x1, x2), max(x1, x2)
+        for dy in range(-radius, radius + 1):
+            if 0 <= y1 + dy < height:
+                w = half_widths[abs(dy)]
+                _fill_span(bitmap, width, y1 + dy, lo - w, hi + w)
+    elif x1 == x2:
+        lo, hi = min(y1, y2), max(y1, y2)
+        for y in range(max(lo - radius, 0), min(hi + radius, height - 1) + 1):
+            # Distance to the closest point of the segment in this row
+            dy = lo - y if y < lo else (y - hi if y > hi else 0)
+            w = half_widths[dy]
+            _fill_span(bitmap, width, y, x1 - w, x1 + w)
+    else:
+        for (px, py) in midpoint_line(x1, y1, x2, y2):
+            for dy in range(-radius, radius + 1):
+                if 0 <= py + dy < height:
+                    w = half_widths[abs(dy)]
+                    _fill_span(bitmap, width, py + dy, px - w, px + w)
+
+def grid_region(bitmap, width, height, start):
+    """
+    Returns the GRID_SIZE-spaced points a snake head can reach from `start`
+    moving between 4-adjacent unblocked points.
+    """
+    def free(x, y):
+        return 0 <= x < width and 0 <= y < height and not bitmap[y * width + x]
+
+    if not free(*start):
+        return set()
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for p in ((x + GRID_SIZE, y), (x - GRID_SIZE, y), (x, y + GRID_SIZE), (x, y - GRID_SIZE)):
+            if p not in seen and free(*p):
+                seen.add(p)
+                stack.append(p)
+    return seen
+
+def check_spawns(bitmap, width, height, spawns):
+    """
+    Raises ValueError if a spawn lies inside an obstacle or the spawns
+    can't reach each other.
+    """
+    for (x, y) in spawns:
+        if bitmap[y * width + x]:
+            raise ValueError(f"spawn {(x, y)} is inside an obstacle")
+    if len(spawns) > 1:
+        region = grid_region(bitmap, width, height, spawns[0])
+        for spawn in spawns[1:]:
+            if spawn not in region:
+                raise ValueError(f"spawn {spawn} can't reach spawn {spawns[0]}")
+
+def compile_level(text):
+    """
+    Compiles a text level description into the binary pack format.
+    """
+    width, height, radius, segments, spawns = parse_level(text)
+
+    bitmap = bytearray(width * height)
+    for seg in segments:
+        dilate_segment(bitmap, width, height, seg, radius)
+    check_spawns(bitmap, width, height, spawns)
+
+    segments_offset = HEADER.size
+    bitmap_offset = segments_offset + len(segments) * SEGMENT.size + len(spawns) * SPAWN.size
+    header = HEADER.pack(MAGIC, VERSION, width, height, radius,
+                         len(segments), len(spawns), segments_offset, bitmap_offset)
+
+    out = bytearray(header)
+    for seg in segments:
+        out += SEGMENT.pack(*seg)
+    for spawn in spawns:
+        out += SPAWN.pack(*spawn)
+    out += bitmap
+    return bytes(out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a snake level pack.")
+    parser.add_argument("source", help="text level description")
+    parser.add_argument("output", help="path of the .lvl file to write")
+    args = parser.parse_args(argv)
+
+    with open(args.source) as f:
+        text = f.read()
+    try:
+        data = compile_level(text)
+    except ValueError as e:
+        sys.exit(f"{args.source}: {e}")
+    with open(args.output, "wb") as f:
+        f.write(data)
+    print(f"Wrote {args.output} ({len(data)} bytes)")
+
+if __name__ == "__main__":
+    main()
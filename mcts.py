@@ -0,0 +1,277 @@
+"""
+Monte Carlo tree search bot for Two-Player mode.
+
+The game hands over a SimState snapshot each tick. Every worker process
+grows its own search tree from that snapshot until the time budget runs
+out (root parallelisation), and the visit counts of the root moves are
+summed to pick a direction. No OpenGL imports here so the workers stay
+lightweight.
+
+The simulation follows check_collision(): boundaries, self-bites,
+obstacles, normal food and snake-vs-snake collisions. Special food is
+left out since it can't be predicted reliably within the search horizon.
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DIRECTIONS = ('LEFT', 'RIGHT', 'UP', 'DOWN')
+OPPOSITE = {'LEFT': 'RIGHT', 'RIGHT': 'LEFT', 'UP': 'DOWN', 'DOWN': 'UP'}
+
+# Search parameters
+ROLLOUT_DEPTH = 30        # Ticks simulated past the root
+EXPLORATION = 1.4         # UCT exploration constant
+
+# -------------------------------------------------------------------------
+# SIMULATION
+# -------------------------------------------------------------------------
+class SimState:
+    """
+    Compact game state for simulations. copy() only duplicates what a
+    step mutates: the snake lists are copied shallowly (points are
+    immutable tuples) and the obstacle cells are a shared frozenset. The
+    random generator is shared rather than copied, see copy().
+    """
+    __slots__ = ('snakes', 'directions', 'alive', 'scores', 'food',
+                 'blocked', 'width', 'height', 'cell', 'rng')
+
+    def __init__(self, snakes, directions, alive, scores, food, blocked,
+                 width, height, cell, seed=None):
+        self.snakes = [list(s) for s in snakes]
+        self.directions = list(directions)
+        self.alive = list(alive)
+        self.scores = list(scores)
+        self.food = food
+        self.blocked = frozenset(blocked)   # Grid cells that touch an obstacle
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.rng = random.Random(seed)
+
+    def copy(self, rng=None):
+        """
+        The copy draws its random numbers from `rng`, or shares this
+        state's generator. Generators aren't copied: seeding a fresh one
+        costs several times more than copying the rest of the state.
+        """
+        new = SimState.__new__(SimState)
+        new.snakes = [list(s) for s in self.snakes]
+        new.directions = list(self.directions)
+        new.alive = list(self.alive)
+        new.scores = list(self.scores)
+        new.food = self.food
+        new.blocked = self.blocked
+        new.width = self.width
+        new.height = self.height
+        new.cell = self.cell
+        new.rng = self.rng if rng is None else rng
+        return new
+
+    def next_head(self, i, direction):
+        x, y = self.snakes[i][-1]
+        c = self.cell
+        if direction == 'LEFT':
+            return (x - c, y)
+        if direction == 'RIGHT':
+            return (x + c, y)
+        if direction == 'UP':
+            return (x, y + c)
+        return (x, y - c)
+
+    def deadly(self, i, head):
+        """
+        Cheap check for moves that obviously kill snake i.
+        """
+        x, y = head
+        return (not (0 <= x < self.width and 0 <= y < self.height)
+                or head in self.blocked
+                or head in self.snakes[i][1:])
+
+    def legal_moves(self, i):
+        """
+        All directions except turning back into the neck.
+        """
+        if len(self.snakes[i]) > 1:
+            back = OPPOSITE[self.directions[i]]
+            return [d for d in DIRECTIONS if d != back]
+        return list(DIRECTIONS)
+
+    def random_move(self, i):
+        """
+        Random move that avoids immediate death when possible.
+        """
+        moves = self.legal_moves(i)
+        safe = [d for d in moves if not self.deadly(i, self.next_head(i, d))]
+        return self.rng.choice(safe or moves)
+
+    def step(self, moves):
+        """
+        Advances one tick. `moves` holds a direction per snake.
+        """
+        for i, snake in enumerate(self.snakes):
+            if self.alive[i]:
+                self.directions[i] = moves[i]
+                snake.append(self.next_head(i, moves[i]))
+                snake.pop(0)
+
+        for i, snake in enumerate(self.snakes):
+            if not self.alive[i]:
+                continue
+            head = snake[-1]
+            x, y = head
+            if (not (0 <= x < self.width and 0 <= y < self.height)
+                    or head in snake[:-1] or head in self.blocked):
+                self.alive[i] = False
+            elif head == self.food:
+                self.scores[i] += 1
+                snake.insert(0, snake[0])  # Grow
+                c = self.cell
+                self.food = (self.rng.randint(1, (self.width // c) - 1) * c,
+                             self.rng.randint(1, (self.height // c) - 1) * c)
+
+        if len(self.snakes) == 2 and self.alive[0] and self.alive[1]:
+            s1, s2 = self.snakes
+            if s1[-1] in s2 or s2[-1] in s1:
+                self.alive[0] = self.alive[1] = False
+
+# -------------------------------------------------------------------------
+# SEARCH
+# -------------------------------------------------------------------------
+class _Node:
+    __slots__ = ('children', 'visits', 'value')
+
+    def __init__(self):
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+def _reward(state, bot, start_score):
+    """
+    0 for dying, otherwise survival plus a bonus for food eaten.
+    """
+    if not state.alive[bot]:
+        return 0.0
+    return 0.6 + 0.1 * min(state.scores[bot] - start_score, 4)
+
+def search(root, bot, budget, seed=None):
+    """
+    Runs MCTS from `root` for `budget` seconds, controlling snake `bot`.
+    Returns ({direction: (visits, value)}, rollouts).
+    """
+    deadline = time.perf_counter() + budget
+    rng = random.Random(seed)
+    other = 1 - bot
+    start_score = root.scores[bot]
+    tree = _Node()
+    rollouts = 0
+
+    while True:
+        state = root.copy(rng)
+        node = tree
+        path = [tree]
+        depth = 0
+
+        # Selection / expansion over the bot's moves; the opponent plays
+        # random safe moves (open-loop tree).
+        while state.alive[bot] and depth < ROLLOUT_DEPTH:
+            moves = state.legal_moves(bot)
+            untried = [d for d in moves if d not in node.children]
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = _Node()
+            else:
+                log_n = math.log(node.visits)
+                move = max(moves, key=lambda d: (
+                    node.children[d].value / node.children[d].visits
+                    + EXPLORATION * math.sqrt(log_n / node.children[d].visits)))
+            step = [None, None]
+            step[bot] = move
+            step[other] = state.random_move(other) if state.alive[other] else None
+            state.step(step)
+            node = node.children[move]
+            path.append(node)
+            depth += 1
+            if untried:
+                break
+
+        # Rollout
+        while state.alive[bot] and depth < ROLLOUT_DEPTH:
+            step = [None, None]
+            step[bot] = state.random_move(bot)
+            step[other] = state.random_move(other) if state.alive[other] else None
+            state.step(step)
+            depth += 1
+
+        reward = _reward(state, bot, start_score)
+        for n in path:
+            n.visits += 1
+            n.value += reward
+        rollouts += 1
+
+        if time.perf_counter() >= deadline:
+            break
+
+    stats = {d: (child.visits, child.value) for d, child in tree.children.items()}
+    return stats, rollouts
+
+# -------------------------------------------------------------------------
+# WORKER POOL
+# -------------------------------------------------------------------------
+class MCTSBot:
+    """
+    Spreads searches over a process pool and keeps rollout statistics.
+    """
+
+    def __init__(self, workers=None, seed=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        # Own RNG so the bot never draws from the game's seeded one
+        self.rng = random.Random(seed)
+        # Time spent pickling, submitting and collecting around the search
+        # itself, smoothed over recent ticks and taken off the budget
+        self.overhead = 0.0
+        self.rollouts = 0
+        self.search_time = 0.0
+
+    def choose(self, state, bot, budget):
+        """
+        Returns the best direction for snake `bot` within `budget` seconds,
+        including the cost of handing the search to the pool.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        start = time.perf_counter()
+        search_budget = max(budget - self.overhead, budget * 0.1)
+        futures = [self._pool.submit(search, state, bot, search_budget, self.rng.random())
+                   for _ in range(self.workers)]
+        totals = {}
+        for f in futures:
+            stats, rollouts = f.result()
+            self.rollouts += rollouts
+            for d, (visits, value) in stats.items():
+                v, s = totals.get(d, (0, 0.0))
+                totals[d] = (v + visits, s + value)
+        elapsed = time.perf_counter() - start
+        self.search_time += elapsed
+        self.overhead = 0.8 * self.overhead + 0.2 * max(elapsed - search_budget, 0.0)
+
+        if not totals:
+            return state.directions[bot]
+        return max(totals, key=lambda d: totals[d])
+
+    def rollouts_per_second(self):
+        """
+        Rollouts/sec since the last call, summed over all workers.
+        """
+        rate = self.rollouts / self.search_time if self.search_time else 0.0
+        self.rollouts = 0
+        self.search_time = 0.0
+        return rate
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,143 @@
+"""
+In-memory rewind buffer.
+
+Game history is kept as one small delta per tick (new head and growth for
+each snake, the scalar values that changed, the obstacle count) in a
+fixed-size ring, plus a full keyframe every `keyframe_interval` ticks.
+Seeking restores the nearest keyframe at or before the target tick and
+replays at most `keyframe_interval - 1` deltas on top of it.
+
+A recorded state is a dict with 'snake1', 'snake2' (lists of points),
+'obstacles_lines' (list of lines) and any number of immutable scalar
+values (directions, food, scores, timers, ...).
+"""
+
+SNAKE_KEYS = ('snake1', 'snake2')
+LINES_KEY = 'obstacles_lines'
+
+
+class RewindBuffer:
+    """
+    Bounded tick history. Holds at most `capacity` ticks; older ticks are
+    overwritten as new ones are recorded.
+    """
+
+    def __init__(self, capacity, keyframe_interval=32):
+        if capacity < 1 or keyframe_interval < 1:
+            raise ValueError("capacity and keyframe_interval must be positive")
+        self.capacity = capacity
+        self.keyframe_interval = keyframe_interval
+        self._deltas = [None] * capacity
+        # Enough keyframe slots to cover every tick still in the delta ring
+        self._keyframes = [None] * (capacity // keyframe_interval + 2)
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets all history. Call this whenever the game is reset.
+        """
+        self._deltas[:] = [None] * self.capacity
+        self._keyframes[:] = [None] * len(self._keyframes)
+        self._newest = -1
+        self._highest = -1        # Newest tick ever written since clear()
+        self.cursor = -1          # Tick the game is currently at
+        self._lines = []          # Append-only log of obstacle lines
+        self._base = None         # Summary of the state at `cursor`
+
+    @property
+    def newest(self):
+        return self._newest
+
+    @property
+    def oldest(self):
+        """
+        Earliest tick that can still be restored, or -1 if empty.
+        """
+        if self._newest < 0:
+            return -1
+        # Ticks discarded by a rewind still overwrote their ring slots
+        first = self._highest - self.capacity + 1
+        if first <= 0:
+            return 0
+        # The keyframe we start from must be no older than the first
+        # delta still in the ring (minus one, since it is a full state).
+        k = self.keyframe_interval
+        return -(-(first - 1) // k) * k
+
+    def record(self, state):
+        """
+        Records `state` as the tick after the cursor. If the game was
+        rewound, the history after the cursor is discarded first.
+        """
+        tick = self.cursor + 1
+        lines = state[LINES_KEY]
+        scalars = {k: v for k, v in state.items()
+                   if k not in SNAKE_KEYS and k != LINES_KEY}
+        snakes = [state[k] for k in SNAKE_KEYS]
+
+        # Lines past the cursor's count belong to a discarded future
+        base_count = self._base[-1] if self._base is not None else 0
+        del self._lines[base_count:]
+        self._lines.extend(lines[base_count:])
+
+        if self._base is None:
+            delta = None
+        else:
+            moves = []
+            for snake, (head, length) in zip(snakes, self._base[0]):
+                grow = len(snake) - length
+                if grow < 0:
+                    raise ValueError("snake shrank; clear() the buffer after a reset")
+                new_head = snake[-1] if snake[-1] != head else None
+                moves.append((new_head, grow))
+            old_scalars = self._base[1]
+            changed = {k: v for k, v in scalars.items()
+                       if k not in old_scalars or old_scalars[k] != v}
+            delta = (moves, changed or None, len(lines))
+        self._deltas[tick % self.capacity] = delta
+
+        if tick % self.keyframe_interval == 0:
+            slot = (tick // self.keyframe_interval) % len(self._keyframes)
+            self._keyframes[slot] = (tick, [tuple(s) for s in snakes],
+                                     scalars, len(lines))
+
+        self._base = ([(s[-1], len(s)) for s in snakes], scalars, len(lines))
+        self._newest = tick
+        self._highest = max(self._highest, tick)
+        self.cursor = tick
+
+    def seek(self, tick):
+        """
+        Moves the cursor to `tick` and returns the state recorded there.
+        The history after `tick` is kept until the next record(), so the
+        caller can scrub forwards again.
+        """
+        if not (self.oldest <= tick <= self._newest) or tick < 0:
+            raise IndexError(f"tick {tick} is not in the rewind buffer")
+
+        k = self.keyframe_interval
+        kf_tick, kf_snakes, kf_scalars, count = \
+            self._keyframes[(tick // k) % len(self._keyframes)]
+        assert kf_tick == tick // k * k
+
+        snakes = [list(s) for s in kf_snakes]
+        scalars = dict(kf_scalars)
+        for t in range(kf_tick + 1, tick + 1):
+            moves, changed, count = self._deltas[t % self.capacity]
+            for snake, (head, grow) in zip(snakes, moves):
+                # Same order as the game: move first, then grow at the tail
+                if head is not None:
+                    snake.append(head)
+                    snake.pop(0)
+                for _ in range(grow):
+                    snake.insert(0, snake[0])
+            if changed:
+                scalars.update(changed)
+
+        self._base = ([(s[-1], len(s)) for s in snakes], dict(scalars), count)
+        self.cursor = tick
+
+        state = dict(scalars)
+        state.update(zip(SNAKE_KEYS, snakes))
+        state[LINES_KEY] = self._lines[:count]
+        return state
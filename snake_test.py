@@ -5,6 +5,17 @@ import random
 import sys
 import math
 import os  # Added import for os module
+import argparse
+import sqlite3
+import time
+from collections import deque
+
+from geometry import midpoint_line
+from levels import LevelPack
+from rewind import RewindBuffer
+from mcts import MCTSBot, SimState
+from leaderboard import GameResult, ResultStore
+from connectivity import FreeSpace, line_cells
 
 # -------------------------------------------------------------------------
 # WINDOW & GLOBAL VARIABLES
@@ -50,9 +61,60 @@ SNAKE_RADIUS = 5
 obstacles_lines = []
 obstacles_points = []
 
+# Grid cells blocked by obstacles, kept so that new obstacles never seal
+# off part of the board. OBSTACLE_ATTEMPTS random lines are tried before
+# giving up on placing one.
+OBSTACLE_ATTEMPTS = 50
+free_space = None
+
+# Free cells Snake 1 can reach from its spawn, see rebuild_free_space().
+# Food is only placed on these; FOOD_ATTEMPTS random picks are tried
+# before choosing from the list of candidates directly.
+FOOD_ATTEMPTS = 100
+reachable = set()
+
+# Level pack (optional, loaded with --level). Its obstacles are checked
+# through the precompiled bitmap and drawn from a cached display list.
+level = None
+level_display_list = None
+
 # Pause state
 paused = False
 
+# Rewind history: per-tick deltas for the last REWIND_SECONDS, sized for
+# the fastest possible tick rate. '[' and ']' scrub by REWIND_STEP ticks.
+REWIND_SECONDS = 120
+REWIND_STEP = 10
+rewind_buffer = RewindBuffer(REWIND_SECONDS * 1000 // min_speed)
+
+# MCTS bot for Snake 2 (Two-Player mode), toggled with 'b'. It may spend
+# BOT_THINK_FRACTION of each tick's interval searching.
+BOT_THINK_FRACTION = 0.5
+BOT_REPORT_INTERVAL = 2000   # Game ms between rollouts/sec reports
+bot = MCTSBot()
+bot_enabled = False
+bot_last_report = 0
+bot_cells_key = None         # Obstacles the cached cells were built from
+bot_cells = frozenset()
+
+# Results database (--db) and the in-game leaderboard toggled with 'l'
+DEFAULT_DB_PATH = "snake_scores.db"
+LEADERBOARD_SIZE = 10
+result_store = None
+show_leaderboard = False
+leaderboard_rows = []
+
+# Event log for heatmap analytics (--events), see heatmap.py. Events are
+# held back until their tick can no longer be rewound over, so the log
+# only ever holds the timeline that was actually played.
+event_log = None
+pending_events = deque()   # (tick, line), oldest first
+
+# Per-game details saved with the result
+game_seed = None
+death_reasons = [None, None]
+result_saved = False   # Survives rewinds so a game is only stored once
+
 # Window ID (to be set in main)
 window_id = None
 
@@ -102,6 +164,39 @@ def display_mode():
         glColor3f(1.0, 1.0, 1.0)  # White color for the mode
         render_text(width // 2 - 50, height - 40, mode_text)
 
+def display_leaderboard():
+    """
+    Displays the top scores fetched when the leaderboard was opened.
+    """
+    glColor3f(1.0, 1.0, 0.0)  # Yellow for the leaderboard
+    render_text(width // 2 - 50, height - 80, "LEADERBOARD")
+    if not leaderboard_rows:
+        render_text(width // 2 - 100, height - 105, "No games recorded yet")
+    for i, (player, score, mode, _) in enumerate(leaderboard_rows):
+        mode_name = 'Single-Player' if mode == 'SINGLE' else 'Two-Player'
+        render_text(width // 2 - 170, height - 105 - 20 * i,
+                    f"{i + 1:2}. {player:<14} {score:4}   {mode_name}")
+
+def log_event(kind, pos, reason=None):
+    """
+    Queues a positional event for the event log, if one is open. It is
+    tagged with the tick update() is about to record.
+    """
+    if event_log is None:
+        return
+    line = f"{kind} {pos[0]} {pos[1]}"
+    if reason:
+        line += f" {reason}"
+    pending_events.append((rewind_buffer.cursor + 1, line + "\n"))
+
+def write_events(upto=None):
+    """
+    Writes the queued events of ticks up to `upto` (all of them by
+    default) to the event log.
+    """
+    while pending_events and (upto is None or pending_events[0][0] <= upto):
+        event_log.write(pending_events.popleft()[1])
+
 def print_score():
     """
     Prints the final scores to the terminal.
@@ -109,82 +204,8 @@ def print_score():
     print(f"Score - Snake 1: {scores[0]}   Score - Snake 2: {scores[1]}")
 
 # -------------------------------------------------------------------------
-# MIDPOINT LINE HELPER FUNCTIONS
+# BOUNDARY DRAWING
 # -------------------------------------------------------------------------
-def get_zone(x1, y1, x2, y2):
-    dx = x2 - x1
-    dy = y2 - y1
-    
-    if dx >= 0 and dy >= 0:
-        if abs(dx) >= abs(dy):
-            return 0
-        return 1
-    elif dx < 0 and dy >= 0:
-        if abs(dx) >= abs(dy):
-            return 3
-        return 2
-    elif dx < 0 and dy < 0:
-        if abs(dx) >= abs(dy):
-            return 4
-        return 5
-    else:  # dx >= 0 and dy < 0
-        if abs(dx) >= abs(dy):
-            return 7
-        return 6
-
-def convert_to_zone0(x, y, zone):
-    if zone == 0: return (x, y)
-    elif zone == 1: return (y, x)
-    elif zone == 2: return (y, -x)
-    elif zone == 3: return (-x, y)
-    elif zone == 4: return (-x, -y)
-    elif zone == 5: return (-y, -x)
-    elif zone == 6: return (-y, x)
-    elif zone == 7: return (x, -y)
-
-def convert_from_zone0(x, y, zone):
-    if zone == 0: return (x, y)
-    elif zone == 1: return (y, x)
-    elif zone == 2: return (-y, x)
-    elif zone == 3: return (-x, y)
-    elif zone == 4: return (-x, -y)
-    elif zone == 5: return (-y, -x)
-    elif zone == 6: return (y, -x)
-    elif zone == 7: return (x, -y)
-
-def midpoint_line(x1, y1, x2, y2):
-    """
-    Draws a line using the Midpoint (Bresenham) line algorithm.
-    Returns a list of all (x,y) points on the line (for collision checks).
-    """
-    points = []
-    zone = get_zone(x1, y1, x2, y2)
-    
-    x1_z0, y1_z0 = convert_to_zone0(x1, y1, zone)
-    x2_z0, y2_z0 = convert_to_zone0(x2, y2, zone)
-    
-    dx = x2_z0 - x1_z0
-    dy = y2_z0 - y1_z0
-    d = 2 * dy - dx
-    d_E = 2 * dy
-    d_NE = 2 * (dy - dx)
-    
-    x = x1_z0
-    y = y1_z0
-    
-    while x <= x2_z0:
-        orig_x, orig_y = convert_from_zone0(x, y, zone)
-        points.append((orig_x, orig_y))
-        
-        if d <= 0:
-            d += d_E
-        else:
-            y += 1
-            d += d_NE
-        x += 1
-    
-    return points
-
 def draw_boundaries():
     """
     Draws boundary lines around the game field using the Midpoint line algorithm.
@@ -265,12 +286,50 @@ def generate_obstacle():
         y2 = random.randint(height // 2, height - 2)
         return (x, y1, x, y2)
 
+def obstacle_grid_cells(line):
+    """
+    Returns the grid cells a snake head can't enter because of the line.
+    """
+    return line_cells(line, SNAKE_RADIUS, cell_size, free_space.cols, free_space.rows)
+
+def rebuild_free_space():
+    """
+    Recomputes the blocked grid cells from the level and obstacles_lines,
+    and the cells reachable from Snake 1's spawn. Obstacles are only added
+    with try_block(), which never splits that region.
+    """
+    global free_space, reachable
+    free_space = FreeSpace(width // cell_size, height // cell_size)
+    if level is not None:
+        free_space.block((i, j)
+                         for i in range(free_space.cols)
+                         for j in range(free_space.rows)
+                         if level.blocked(i * cell_size, j * cell_size))
+    for line in obstacles_lines:
+        free_space.block(obstacle_grid_cells(line))
+    sx, sy = spawn_points()[0]
+    reachable = free_space.region((sx // cell_size, sy // cell_size))
+
 def add_obstacle():
     """
     Generates a new obstacle line, adds it to obstacles_lines,
     and also stores all its points in obstacles_points for collision checks.
+    Lines that would cut off part of the board, or cover the food or a
+    live snake's head, are rejected and another one is tried.
     """
-    line = generate_obstacle()
+    protected = {(food[0] // cell_size, food[1] // cell_size)}
+    if snake1_alive:
+        protected.add((snake1[-1][0] // cell_size, snake1[-1][1] // cell_size))
+    if game_mode == 'TWO' and snake2_alive:
+        protected.add((snake2[-1][0] // cell_size, snake2[-1][1] // cell_size))
+
+    for _ in range(OBSTACLE_ATTEMPTS):
+        line = generate_obstacle()
+        if free_space.try_block(obstacle_grid_cells(line), protected):
+            break
+    else:
+        print("No obstacle added: every candidate would seal off part of the board.")
+        return
     obstacles_lines.append(line)
 
     # Convert the line into a set of points
@@ -282,13 +341,38 @@ def add_obstacle():
 # -------------------------------------------------------------------------
 # GAME LOGIC FUNCTIONS
 # -------------------------------------------------------------------------
+def spawn_points():
+    """
+    Returns the starting heads of Snake 1 and Snake 2: the level's spawn
+    points if it has them, otherwise the default corners.
+    """
+    spawns = [(40, 40), (760, 560)]
+    if level is not None:
+        for i, spawn in enumerate(level.spawns[:2]):
+            spawns[i] = tuple(spawn)
+    return spawns
+
+def food_cells():
+    """
+    Returns the reachable, unblocked cells food may be placed on.
+    """
+    return sorted((i, j) for (i, j) in reachable
+                  if i >= 1 and j >= 1 and not free_space.is_blocked(i, j))
+
 def generate_food():
     """
-    Generate normal or special food positions, ensuring they're within boundaries.
+    Generate normal or special food positions, ensuring they're within boundaries
+    and reachable. The current food's cell is never covered by an obstacle,
+    so there is always at least one candidate.
     """
-    x = random.randint(1, (width // cell_size) - 1) * cell_size
-    y = random.randint(1, (height // cell_size) - 1) * cell_size
-    return x, y
+    for _ in range(FOOD_ATTEMPTS):
+        i = random.randint(1, (width // cell_size) - 1)
+        j = random.randint(1, (height // cell_size) - 1)
+        if (i, j) in reachable and not free_space.is_blocked(i, j):
+            return i * cell_size, j * cell_size
+    # Mostly blocked level: pick from the candidates instead
+    i, j = random.choice(food_cells())
+    return i * cell_size, j * cell_size
 
 def special_keys(key, x, y):
     """
@@ -311,8 +395,12 @@ def keyboard(key, x, y):
       - '1' key: Single-Player mode
       - '2' key: Two-Player mode
       - WASD for Snake 1 movement
+      - '[' / ']': rewind / fast-forward through recent history (pauses)
+      - 'b' key: toggle the MCTS bot for Snake 2 (Two-Player mode)
+      - 'l' key: show / hide the leaderboard
     """
-    global direction1, game_mode, paused, game_over
+    global direction1, game_mode, paused, game_over, bot_enabled
+    global show_leaderboard, leaderboard_rows
     try:
         key = key.decode('utf-8')  # Decode byte to string
     except AttributeError:
@@ -329,6 +417,26 @@ def keyboard(key, x, y):
         game_mode = 'TWO'
         reset_game()
         paused = False
+    elif key.lower() == 'l':
+        if result_store is None:
+            print("No results database open.")
+            return
+        show_leaderboard = not show_leaderboard
+        if show_leaderboard:
+            result_store.flush(timeout=0.2)  # Include the game that just ended
+            leaderboard_rows = result_store.top_scores(LEADERBOARD_SIZE)
+        glutPostRedisplay()
+    elif key.lower() == 'b' and game_mode == 'TWO':
+        bot_enabled = not bot_enabled
+        print(f"Snake 2 bot {'enabled' if bot_enabled else 'disabled'} ({bot.workers} workers)")
+    elif key in ('[', ']') and game_mode is not None:
+        step = -REWIND_STEP if key == '[' else REWIND_STEP
+        tick = rewind_buffer.cursor + step
+        tick = max(rewind_buffer.oldest, min(rewind_buffer.newest, tick))
+        paused = True  # Resume with the Pause button
+        restore_state(rewind_buffer.seek(tick))
+        print(f"Rewound to tick {tick} ({time_passed / 1000:.1f}s)")
+        glutPostRedisplay()
     elif game_mode == 'SINGLE' or game_mode == 'TWO':
         if game_mode == 'SINGLE' or (game_mode == 'TWO' and snake1_alive):
             if key.lower() == 'a':
@@ -375,6 +483,12 @@ def mouse(button, state, x, y):
             print("Close Button Clicked")
             # Destroy the window and exit
             glutDestroyWindow(window_id)
+            bot.close()
+            if result_store is not None:
+                result_store.close()  # Write any queued results first
+            if event_log is not None:
+                write_events()
+                event_log.close()
             os._exit(0)  # Replaced sys.exit() with os._exit(0) for immediate termination
 
     # Removed mode selection via mouse clicks
@@ -387,10 +501,24 @@ def reset_game():
     global special_food_active, special_food_position
     global time_passed, last_special_food_time
     global snake1_alive, snake2_alive, direction1, direction2
-    global obstacles_lines, obstacles_points, paused
+    global obstacles_lines, obstacles_points, paused, bot_last_report
+    global game_seed, death_reasons, result_saved
+
+    # The previous game can't be rewound any more
+    write_events()
+
+    # Seed each game so a saved result can be replayed
+    game_seed = random.randrange(2**32)
+    random.seed(game_seed)
+
+    # Clear out any old obstacles
+    obstacles_lines = []
+    obstacles_points = []
+    rebuild_free_space()
 
-    snake1 = [(40, 40)]
-    snake2 = [(760, 560)]
+    spawn1, spawn2 = spawn_points()
+    snake1 = [spawn1]
+    snake2 = [spawn2]
     direction1 = 'RIGHT'
     direction2 = 'LEFT'
 
@@ -400,16 +528,19 @@ def reset_game():
 
     snake1_alive = True
     snake2_alive = True
+    death_reasons = [None, None]
+    result_saved = False
 
     # Reset special-food-related variables
     special_food_active = False
     special_food_position = None
     time_passed = 0
     last_special_food_time = 0
+    bot_last_report = 0
 
-    # Clear out any old obstacles
-    obstacles_lines = []
-    obstacles_points = []
+    # Start a fresh history with the initial state as tick 0
+    rewind_buffer.clear()
+    rewind_buffer.record(capture_state())
 
 def move_snake(snake, direction):
     """
@@ -441,10 +572,39 @@ def decide_winner():
 
     if scores[0] > scores[1]:
         print("Snake 1 is the winner!")
+        winner = 0
     elif scores[0] < scores[1]:
         print("Snake 2 is the winner!")
+        winner = 1
     else:
         print("It's a tie!")
+        winner = None
+
+    save_result(winner if game_mode == 'TWO' else None)
+
+def save_result(winner):
+    """
+    Queues the finished game for the results database. A game that is
+    rewound and ends again keeps its first result.
+    """
+    global result_saved
+    if result_store is None or result_saved:
+        return
+    result_saved = True
+    players = ['Snake 1']
+    if game_mode == 'TWO':
+        players.append('Snake 2 (bot)' if bot_enabled else 'Snake 2')
+    n = len(players)
+    result_store.submit(GameResult(
+        mode=game_mode,
+        players=tuple(players),
+        scores=tuple(scores[:n]),
+        winner=winner,
+        duration_ms=time_passed,
+        deaths=tuple(death_reasons[:n]),
+        seed=game_seed,
+        finished_at=time.time(),
+    ))
 
 def kill_snake1(reason):
     """
@@ -452,6 +612,8 @@ def kill_snake1(reason):
     """
     global snake1_alive
     snake1_alive = False
+    death_reasons[0] = reason
+    log_event('death', snake1[-1], reason)
     print(f"Snake 1 died ({reason}).")
 
 def kill_snake2(reason):
@@ -460,6 +622,8 @@ def kill_snake2(reason):
     """
     global snake2_alive
     snake2_alive = False
+    death_reasons[1] = reason
+    log_event('death', snake2[-1], reason)
     print(f"Snake 2 died ({reason}).")
 
 def check_obstacle_collision(head, radius=SNAKE_RADIUS):
@@ -470,6 +634,10 @@ def check_obstacle_collision(head, radius=SNAKE_RADIUS):
     hx, hy = head
     r2 = radius * radius
 
+    # Level packs are compiled for SNAKE_RADIUS (checked in main)
+    if level is not None and level.blocked(hx, hy):
+        return True
+
     for obs_set in obstacles_points:
         for (px, py) in obs_set:
             dx = px - hx
@@ -514,10 +682,12 @@ def check_collision():
                 snake1.insert(0, snake1[0])  # Grow
                 food = generate_food()
                 print(f"Score Updated - Snake 1: {scores[0]}")
+                log_event('food', head1)
 
             if special_food_active and head1 == special_food_position:
                 scores[0] += 3
                 print(f"Snake 1 ate special food! +3 points. Total = {scores[0]}")
+                log_event('food', head1)
                 special_food_active = False
                 add_obstacle()
 
@@ -541,10 +711,12 @@ def check_collision():
                 snake2.insert(0, snake2[0])  # Grow
                 food = generate_food()
                 print(f"Score Updated - Snake 2: {scores[1]}")
+                log_event('food', head2)
 
             if special_food_active and head2 == special_food_position:
                 scores[1] += 3
                 print(f"Snake 2 ate special food! +3 points. Total = {scores[1]}")
+                log_event('food', head2)
                 special_food_active = False
                 add_obstacle()
 
@@ -592,6 +764,115 @@ def get_game_speed():
         new_speed = min_speed
     return new_speed
 
+# -------------------------------------------------------------------------
+# REWIND FUNCTIONS
+# -------------------------------------------------------------------------
+def capture_state():
+    """
+    Returns the current game state in the form RewindBuffer records.
+    """
+    return {
+        'snake1': snake1,
+        'snake2': snake2,
+        'obstacles_lines': obstacles_lines,
+        'direction1': direction1,
+        'direction2': direction2,
+        'snake1_alive': snake1_alive,
+        'snake2_alive': snake2_alive,
+        'food': food,
+        'scores': tuple(scores),
+        'death_reasons': tuple(death_reasons),
+        'game_over': game_over,
+        'time_passed': time_passed,
+        'last_special_food_time': last_special_food_time,
+        'special_food_active': special_food_active,
+        'special_food_position': special_food_position,
+        'special_food_start_time': special_food_start_time,
+    }
+
+def restore_state(state):
+    """
+    Puts the game back into a state returned by RewindBuffer.seek().
+    """
+    global snake1, snake2, direction1, direction2, snake1_alive, snake2_alive
+    global food, scores, game_over, time_passed, last_special_food_time
+    global special_food_active, special_food_position, special_food_start_time
+    global obstacles_lines, obstacles_points, death_reasons
+
+    snake1 = state['snake1']
+    snake2 = state['snake2']
+    direction1 = state['direction1']
+    direction2 = state['direction2']
+    snake1_alive = state['snake1_alive']
+    snake2_alive = state['snake2_alive']
+    food = state['food']
+    scores = list(state['scores'])
+    death_reasons = list(state['death_reasons'])
+    game_over = state['game_over']
+    time_passed = state['time_passed']
+    last_special_food_time = state['last_special_food_time']
+    special_food_active = state['special_food_active']
+    special_food_position = state['special_food_position']
+    special_food_start_time = state['special_food_start_time']
+
+    # Obstacles only ever get appended, so keep the point sets we already
+    # have for the shared prefix and only rasterise the rest.
+    lines = state['obstacles_lines']
+    keep = 0
+    while keep < min(len(lines), len(obstacles_lines)) and lines[keep] == obstacles_lines[keep]:
+        keep += 1
+    obstacles_points = obstacles_points[:keep] + [set(midpoint_line(*line)) for line in lines[keep:]]
+    obstacles_lines = lines
+    rebuild_free_space()
+
+# -------------------------------------------------------------------------
+# BOT FUNCTIONS
+# -------------------------------------------------------------------------
+def obstacle_cells():
+    """
+    Returns the grid cells a head can't enter without touching an obstacle.
+    Cached until the obstacles change.
+    """
+    global bot_cells_key, bot_cells
+    key = tuple(obstacles_lines)
+    if key == bot_cells_key:
+        return bot_cells
+
+    r = SNAKE_RADIUS
+    cells = set()
+    for pts in obstacles_points:
+        for (px, py) in pts:
+            # Grid coordinates within r of the point on each axis
+            for cx in range(-(-(px - r) // cell_size) * cell_size, px + r + 1, cell_size):
+                for cy in range(-(-(py - r) // cell_size) * cell_size, py + r + 1, cell_size):
+                    if (cx - px)**2 + (cy - py)**2 <= r*r:
+                        cells.add((cx, cy))
+    if level is not None:
+        for cx in range(0, width, cell_size):
+            for cy in range(0, height, cell_size):
+                if level.blocked(cx, cy):
+                    cells.add((cx, cy))
+
+    bot_cells_key = key
+    bot_cells = frozenset(cells)
+    return bot_cells
+
+def bot_move():
+    """
+    Lets the MCTS bot pick Snake 2's direction for this tick.
+    """
+    global direction2, bot_last_report
+    state = SimState([snake1, snake2], [direction1, direction2],
+                     [snake1_alive, snake2_alive], scores, food,
+                     obstacle_cells(), width, height, cell_size,
+                     seed=bot.rng.random())
+    budget = get_game_speed() * BOT_THINK_FRACTION / 1000
+    direction2 = bot.choose(state, 1, budget)
+
+    if time_passed - bot_last_report >= BOT_REPORT_INTERVAL:
+        bot_last_report = time_passed
+        print(f"Bot: {bot.rollouts_per_second():.0f} rollouts/s on {bot.workers} workers")
+
 # -------------------------------------------------------------------------
 # UPDATE FUNCTION (GAME LOOP)
 # -------------------------------------------------------------------------
@@ -606,6 +887,7 @@ def update(value):
     if game_over or paused:
         return  # No updates if the game is over or paused
 
+    tick_start = time.perf_counter()
     interval = get_game_speed()
     time_passed += interval
 
@@ -622,17 +904,37 @@ def update(value):
 
     # Move the snakes that are alive
     if game_mode is not None:
+        # Events queued after the cursor belong to a timeline that was
+        # rewound over and is now being replaced
+        while pending_events and pending_events[-1][0] > rewind_buffer.cursor:
+            pending_events.pop()
+
+        if bot_enabled and game_mode == 'TWO' and snake2_alive:
+            bot_move()
         if snake1_alive:
             move_snake(snake1, direction1)
         if game_mode == 'TWO' and snake2_alive:
             move_snake(snake2, direction2)
 
         # Check collisions
-        if check_collision():
+        ended = check_collision()
+
+        # Heads that died this tick were logged as deaths instead
+        if snake1_alive:
+            log_event('head', snake1[-1])
+        if game_mode == 'TWO' and snake2_alive:
+            log_event('head', snake2[-1])
+
+        rewind_buffer.record(capture_state())
+        # Ticks before the oldest one in the buffer are final
+        write_events(rewind_buffer.oldest)
+        if ended:
             return
 
     glutPostRedisplay()
-    glutTimerFunc(get_game_speed(), update, 0)
+    # Time spent in this update (e.g. bot thinking) counts towards the tick
+    elapsed_ms = int((time.perf_counter() - tick_start) * 1000)
+    glutTimerFunc(max(get_game_speed() - elapsed_ms, 1), update, 0)
 
 # -------------------------------------------------------------------------
 # DISPLAY FUNCTION
@@ -649,6 +951,8 @@ def display():
 
     # --- Draw Obstacles (Yellow) ---
     glColor3f(1.0, 1.0, 0.0)
+    if level is not None:
+        draw_level()
     for line in obstacles_lines:
         (ox1, oy1, ox2, oy2) = line
         pts = midpoint_line(ox1, oy1, ox2, oy2)
@@ -686,8 +990,27 @@ def display():
     # Display scores and mode
     display_score()
     display_mode()
+    if show_leaderboard:
+        display_leaderboard()
     glutSwapBuffers()
 
+def draw_level():
+    """
+    Draws the level pack's obstacles. The points are rasterised once into
+    a display list so large levels don't redo the midpoint work every frame.
+    """
+    global level_display_list
+    if level_display_list is None:
+        level_display_list = glGenLists(1)
+        glNewList(level_display_list, GL_COMPILE)
+        glBegin(GL_POINTS)
+        for seg in level.segments():
+            for (px, py) in midpoint_line(*seg):
+                glVertex2i(px, py)
+        glEnd()
+        glEndList()
+    glCallList(level_display_list)
+
 # -------------------------------------------------------------------------
 # BUTTON DRAWING FUNCTION
 # -------------------------------------------------------------------------
@@ -776,7 +1099,48 @@ def main():
     """
     Initializes the GLUT window and starts the main loop.
     """
-    global window_id
+    global window_id, level, result_store, event_log
+    parser = argparse.ArgumentParser(description="2D Snake game")
+    parser.add_argument("--level", help="compiled level pack (.lvl) to play on")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help="SQLite database for results (default: %(default)s)")
+    parser.add_argument("--events", help="append head/food/death events to this log")
+    # GLUT consumes its own options, so ignore anything we don't know
+    args, _ = parser.parse_known_args()
+
+    if args.level:
+        try:
+            level = LevelPack(args.level)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Could not load level: {e}")
+        if (level.width, level.height) != (width, height):
+            sys.exit(f"Level is {level.width}x{level.height}, expected {width}x{height}")
+        if level.radius != SNAKE_RADIUS:
+            sys.exit(f"Level was compiled for radius {level.radius}, expected {SNAKE_RADIUS}")
+        for (sx, sy) in level.spawns:
+            if sx % cell_size or sy % cell_size:
+                sys.exit(f"Level spawn {(sx, sy)} is not on the {cell_size}-pixel grid")
+        # Every food has to be reachable, so the snakes must start in one
+        # free region with room for food
+        rebuild_free_space()
+        for (sx, sy) in spawn_points():
+            if free_space.is_blocked(sx // cell_size, sy // cell_size):
+                sys.exit(f"Spawn {(sx, sy)} is inside an obstacle on this level")
+        sx, sy = spawn_points()[1]
+        if (sx // cell_size, sy // cell_size) not in reachable:
+            sys.exit("Snake 2 can't reach Snake 1 on this level")
+        if not food_cells():
+            sys.exit("Level has no reachable cell for food")
+        print(f"Loaded level {args.level} ({level.segment_count} obstacles)")
+
+    if args.events:
+        event_log = open(args.events, "a", buffering=1 << 16)
+
+    try:
+        result_store = ResultStore(args.db)
+    except sqlite3.Error as e:
+        print(f"Results will not be saved: {e}")
+
     glutInit(sys.argv)
     glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB)
     glutInitWindowSize(width, height)
@@ -0,0 +1,102 @@
+import random
+
+from connectivity import FreeSpace, line_cells
+from geometry import midpoint_line
+
+
+def free_regions(space):
+    """
+    Reference: number of 4-connected free regions, by flood fill.
+    """
+    seen = set()
+    regions = 0
+    for i in range(space.cols):
+        for j in range(space.rows):
+            if space.is_blocked(i, j) or (i, j) in seen:
+                continue
+            regions += 1
+            seen.add((i, j))
+            stack = [(i, j)]
+            while stack:
+                a, b = stack.pop()
+                for n in ((a + 1, b), (a - 1, b), (a, b + 1), (a, b - 1)):
+                    if not space.is_blocked(*n) and n not in seen:
+                        seen.add(n)
+                        stack.append(n)
+    return regions
+
+
+def snapshot(space):
+    return bytes(space._blocked), list(space._parent), list(space._size)
+
+
+def random_line(rng, width, height):
+    if rng.random() < 0.5:
+        y = rng.randint(1, height - 2)
+        return (rng.randint(1, width // 2), y, rng.randint(width // 2, width - 2), y)
+    x = rng.randint(1, width - 2)
+    return (x, rng.randint(1, height // 2), x, rng.randint(height // 2, height - 2))
+
+
+def test_splits_matches_flood_fill():
+    rng = random.Random(1)
+    for _ in range(200):
+        space = FreeSpace(10, 8)
+        for _ in range(40):
+            i, j = rng.randrange(10), rng.randrange(8)
+            if space.is_blocked(i, j):
+                continue
+            before = free_regions(space)
+            predicted = space.splits(i, j)
+            space.block([(i, j)])
+            assert predicted == (free_regions(space) > before)
+
+
+def test_try_block_never_splits_and_rolls_back():
+    rng = random.Random(2)
+    space = FreeSpace(40, 30)
+    accepted = 0
+    for _ in range(300):
+        cells = line_cells(random_line(rng, 400, 300), 5, 10, space.cols, space.rows)
+        before = snapshot(space)
+        if space.try_block(cells):
+            accepted += 1
+            assert free_regions(space) == 1
+        else:
+            assert snapshot(space) == before
+    assert accepted > 0
+
+
+def test_protected_cells_are_never_covered():
+    space = FreeSpace(80, 60)
+    cells = line_cells((100, 300, 700, 300), 5, 10, 80, 60)
+    assert not space.try_block(cells, protected={(40, 30)})
+    assert not space.is_blocked(40, 30)
+    assert space.try_block(cells, protected={(40, 40)})
+
+
+def test_line_cells_match_radius_check():
+    rng = random.Random(3)
+    for line in [random_line(rng, 800, 600) for _ in range(6)] + [(10, 10, 200, 100)]:
+        points = midpoint_line(*line)
+        expected = {(i, j) for i in range(80) for j in range(60)
+                    if any((i * 10 - px) ** 2 + (j * 10 - py) ** 2 <= 25 for px, py in points)}
+        assert set(line_cells(line, 5, 10, 80, 60)) == expected
+
+
+def test_region_after_unchecked_blocks():
+    # A wall across the board, as a level can have, leaves two regions
+    space = FreeSpace(10, 8)
+    space.block((4, j) for j in range(8))
+    left = space.region((0, 0))
+    assert left == {(i, j) for i in range(4) for j in range(8)}
+    assert (9, 7) not in left
+    assert space.region((4, 3)) == set()
+
+    # try_block() only ever shrinks a region
+    rng = random.Random(4)
+    for _ in range(100):
+        i, j = rng.randrange(5, 10), rng.randrange(8)
+        before = space.region((9, 7))
+        blocked = space.try_block([(i, j)], protected={(9, 7)})
+        assert space.region((9, 7)) == (before - {(i, j)} if blocked else before)
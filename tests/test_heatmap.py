@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import heatmap
+from heatmap import CHANNELS, Heatmap, accumulate_files, event_channel, read_events
+
+EVENTS = [
+    ('head', 40, 40, None),
+    ('head', 45, 49, None),            # Same 10-pixel cell as above
+    ('head', 50, 40, None),
+    ('food', 790, 590, None),
+    ('death', 800, 40, 'hit boundary'),  # Just off the right edge
+    ('death', -10, 600, 'hit boundary'),  # Off the top-left corner
+    ('death', 120, 300, 'bit itself'),
+    ('death', 120, 300, 'touched obstacle'),
+    ('death', 60, 60, 'collided with Snake 1'),
+    ('death', 60, 60, 'collided with Snake 2'),
+    ('death', 60, 60, 'struck by lightning'),
+    ('jump', 10, 10, None),            # Unknown kinds are skipped
+]
+
+
+def expected_counts():
+    """
+    EVENTS counted by hand, as {(channel, row, col): count}.
+    """
+    return {
+        ('head', 4, 4): 2,
+        ('head', 4, 5): 1,
+        ('food', 59, 79): 1,
+        ('death_boundary', 4, 79): 1,
+        ('death_boundary', 59, 0): 1,
+        ('death_self', 30, 12): 1,
+        ('obstacle_hit', 30, 12): 1,
+        ('death_collision', 6, 6): 2,
+        ('death_other', 6, 6): 1,
+    }
+
+
+def as_dict(hm):
+    return {(CHANNELS[c], r, col): int(hm.counts[c, r, col])
+            for c, r, col in zip(*np.nonzero(hm.counts))}
+
+
+def test_consume_matches_hand_count():
+    hm = Heatmap().consume(EVENTS)
+    assert hm.counts.shape == (len(CHANNELS), 60, 80)
+    assert as_dict(hm) == expected_counts()
+    assert hm.channel('head').sum() == 3
+    assert hm.deaths().sum() == 7
+    assert hm.deaths()[6, 6] == 3
+
+
+def test_chunking_does_not_change_counts(monkeypatch):
+    monkeypatch.setattr(heatmap, 'CHUNK_SIZE', 2)
+    assert as_dict(Heatmap().consume(iter(EVENTS))) == expected_counts()
+
+
+def test_event_channel():
+    assert event_channel('death', 'hit boundary') == 'death_boundary'
+    assert event_channel('death', 'bit itself') == 'death_self'
+    assert event_channel('death', 'touched obstacle') == 'obstacle_hit'
+    assert event_channel('death', 'collided with Snake 2') == 'death_collision'
+    assert event_channel('death', None) == 'death_other'
+    assert event_channel('head', None) == 'head'
+    assert event_channel('food', 'anything') == 'food'
+    assert event_channel('jump', None) is None
+
+
+def test_merge():
+    a = Heatmap().consume(EVENTS[:5])
+    b = Heatmap().consume(EVENTS[5:])
+    assert as_dict(a.merge(b)) == expected_counts()
+
+    with pytest.raises(ValueError):
+        a.merge(Heatmap(400, 300))
+
+
+def test_files_and_workers(tmp_path):
+    lines = []
+    for kind, x, y, reason in EVENTS:
+        lines.append(f"{kind} {x} {y}" + (f" {reason}" if reason else ""))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"game{i}.log"
+        path.write_text("\n".join(lines) + "\n\n")   # Blank lines are ignored
+        paths.append(str(path))
+
+    assert list(read_events(paths[0])) == EVENTS
+    total = accumulate_files(paths, workers=2)
+    assert as_dict(total) == {k: 3 * v for k, v in expected_counts().items()}
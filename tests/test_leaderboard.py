@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+
+import leaderboard
+from leaderboard import GameResult, ResultStore, connect_readonly, player_stats, top_scores
+
+
+def result(scores, winner=None, finished_at=1000.0, players=('Snake 1', 'Snake 2')):
+    players = players[:len(scores)]
+    return GameResult(mode='TWO' if len(scores) == 2 else 'SINGLE',
+                      players=players, scores=tuple(scores), winner=winner,
+                      duration_ms=5000, deaths=('hit boundary',) * len(scores),
+                      seed=42, finished_at=finished_at)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "scores.db")
+
+
+def test_round_trip(db):
+    store = ResultStore(db)
+    try:
+        store.submit(result([3, 7], winner=1, finished_at=100.0))
+        store.submit(result([9], finished_at=200.0))
+        store.submit(result([4, 4], finished_at=300.0))
+        assert store.flush(timeout=5)
+
+        assert store.top_scores(3) == [('Snake 1', 9, 'SINGLE', 200.0),
+                                       ('Snake 2', 7, 'TWO', 100.0),
+                                       ('Snake 1', 4, 'TWO', 300.0)]
+        assert [row[1] for row in store.top_scores(10, 'Snake 2')] == [7, 4]
+        assert store.player_stats('Snake 2') == (2, 1, 7, 5.5)
+        assert store.player_stats('Snake 1') == (3, 0, 9, 16 / 3)
+        assert store.player_stats('Nobody') == (0, None, None, None)
+    finally:
+        store.close()
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT seed, duration_ms FROM games").fetchall() == [(42, 5000)] * 3
+    assert conn.execute("SELECT death_reason FROM game_players WHERE game_id = 1 "
+                        "ORDER BY slot").fetchall() == [('hit boundary',), ('hit boundary',)]
+    conn.close()
+
+
+def test_batches_and_close_write_everything(db, monkeypatch):
+    monkeypatch.setattr(leaderboard, 'BATCH_SIZE', 3)
+    store = ResultStore(db)
+    for i in range(20):
+        store.submit(result([i], finished_at=float(i)))
+    store.close()   # No flush: close() writes what is still queued
+
+    conn = connect_readonly(db)
+    try:
+        rows = top_scores(conn, 100)
+        assert [score for _, score, _, _ in rows] == list(range(19, -1, -1))
+        # Each game keeps its own finish time, whatever batch it was in
+        assert all(played_at == score for _, score, _, played_at in rows)
+        assert player_stats(conn, 'Snake 1')[0] == 20
+    finally:
+        conn.close()
+
+
+def test_top_scores_limit_and_ties(db):
+    store = ResultStore(db)
+    try:
+        for scores in ([1], [5], [5], [2], [8]):
+            store.submit(result(scores))
+        store.flush(timeout=5)
+        assert [row[1] for row in store.top_scores(3)] == [8, 5, 5]
+        assert store.top_scores(0) == []
+    finally:
+        store.close()
+
+
+def test_main_reads_without_creating(tmp_path, capsys):
+    missing = tmp_path / "missing.db"
+    with pytest.raises(SystemExit, match="no such results database"):
+        leaderboard.main([str(missing)])
+    assert not missing.exists()
+
+    db = str(tmp_path / "scores.db")
+    store = ResultStore(db)
+    store.submit(result([3, 6], winner=1))
+    store.close()
+    leaderboard.main([db, "--player", "Snake 2", "-n", "5"])
+    out = capsys.readouterr().out
+    assert "  1. Snake 2" in out
+    assert "Snake 2: 1 games, 1 wins, best 6, average 6.0" in out
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from geometry import midpoint_line
+from levels import (HEADER, MAGIC, SEGMENT, SPAWN, VERSION, LevelPack,
+                    compile_level, dilate_segment)
+
+LEVEL = """
+size 200 100
+radius 5
+spawn 20 20
+spawn 180 80
+line 50 10 50 60
+line 100 99 150 99
+line 0 99 30 69
+"""
+
+
+def write(tmp_path, data, name="level.lvl"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def brute_force(width, height, segment, radius):
+    """
+    Reference: every pixel within `radius` of a midpoint-line point.
+    """
+    bitmap = bytearray(width * height)
+    for (px, py) in midpoint_line(*segment):
+        for y in range(height):
+            for x in range(width):
+                if (x - px) ** 2 + (y - py) ** 2 <= radius * radius:
+                    bitmap[y * width + x] = 1
+    return bitmap
+
+
+def test_round_trip(tmp_path):
+    pack = LevelPack(write(tmp_path, compile_level(LEVEL)))
+    try:
+        assert (pack.width, pack.height, pack.radius) == (200, 100, 5)
+        assert list(pack.segments()) == [(50, 10, 50, 60), (100, 99, 150, 99), (0, 99, 30, 69)]
+        assert pack.spawns == [(20, 20), (180, 80)]
+        assert pack.blocked(50, 35) and pack.blocked(55, 35) and not pack.blocked(56, 35)
+        assert not pack.blocked(-1, 0) and not pack.blocked(200, 0)
+    finally:
+        pack.close()
+
+
+@pytest.mark.parametrize("segment", [
+    (0, 0, 39, 0), (39, 29, 0, 29), (0, 0, 0, 29), (39, 5, 39, 20),
+    (20, 15, 20, 15), (0, 0, 39, 29), (39, 0, 0, 29), (3, 27, 17, 2), (10, 10, 12, 25),
+])
+@pytest.mark.parametrize("radius", [0, 1, 5])
+def test_dilation_matches_brute_force(segment, radius):
+    width, height = 40, 30
+    bitmap = bytearray(width * height)
+    dilate_segment(bitmap, width, height, segment, radius)
+    assert bitmap == brute_force(width, height, segment, radius)
+
+
+def test_garbage_and_truncated_headers(tmp_path):
+    data = compile_level(LEVEL)
+    rng = random.Random(3)
+    cases = [
+        b"",
+        b"SNAKELVL",
+        data[:HEADER.size - 1],
+        data[:HEADER.size + 4],
+        data[:-1],
+        b"NOTALVL!" + data[8:],
+        HEADER.pack(MAGIC, VERSION + 1, 200, 100, 5, 0, 0, HEADER.size, HEADER.size),
+        bytes(rng.randrange(256) for _ in range(200)),
+    ]
+    for i, case in enumerate(cases):
+        with pytest.raises(ValueError):
+            LevelPack(write(tmp_path, case, f"bad{i}.lvl"))
+
+
+def test_tables_overlapping_the_bitmap(tmp_path):
+    data = bytearray(compile_level(LEVEL))
+    (_, _, width, height, radius, segments, spawns,
+     segments_offset, bitmap_offset) = HEADER.unpack_from(data)
+
+    # Spawn table running into the bitmap
+    bad = bytearray(data)
+    HEADER.pack_into(bad, 0, MAGIC, VERSION, width, height, radius, segments,
+                     spawns + 1, segments_offset, bitmap_offset)
+    with pytest.raises(ValueError):
+        LevelPack(write(tmp_path, bytes(bad), "spawns.lvl"))
+
+    # Segment table starting inside the header
+    bad = bytearray(data)
+    HEADER.pack_into(bad, 0, MAGIC, VERSION, width, height, radius, segments,
+                     spawns, HEADER.size - SEGMENT.size, bitmap_offset)
+    with pytest.raises(ValueError):
+        LevelPack(write(tmp_path, bytes(bad), "segments.lvl"))
+
+    # Bitmap running past the end of the file
+    bad = bytearray(data)
+    HEADER.pack_into(bad, 0, MAGIC, VERSION, width, height, radius, segments,
+                     spawns, segments_offset, bitmap_offset + SPAWN.size)
+    with pytest.raises(ValueError):
+        LevelPack(write(tmp_path, bytes(bad), "bitmap.lvl"))
+
+
+@pytest.mark.parametrize("text, message", [
+    ("spawn 45 40", "grid"),
+    ("spawn 800 40", "outside"),
+    ("line 100 100 200 100\nspawn 100 100", "inside an obstacle"),
+    ("line 100 105 200 105\nspawn 150 100", "inside an obstacle"),
+    # A box around the second spawn
+    ("line 300 200 400 200\nline 300 300 400 300\nline 300 200 300 300\n"
+     "line 400 200 400 300\nspawn 40 40\nspawn 350 250", "can't reach"),
+    ("radius -1", "radius"),
+    ("line 0 0 800 0", "outside"),
+    ("wall 1 2", "unknown directive"),
+])
+def test_invalid_levels(text, message):
+    with pytest.raises(ValueError, match=message):
+        compile_level(text)
+
+
+def test_spawns_next_to_obstacles_are_accepted():
+    # 10 pixels from the line is outside the radius of 5
+    compile_level("line 100 100 200 100\nspawn 150 110\nspawn 150 90")
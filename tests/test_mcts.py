@@ -0,0 +1,109 @@
+import random
+
+from mcts import SimState, search
+
+
+def make_state(snake1, snake2=None, directions=('RIGHT', 'LEFT'), food=(400, 300),
+               blocked=(), seed=1):
+    snakes = [snake1] if snake2 is None else [snake1, snake2]
+    n = len(snakes)
+    return SimState(snakes, directions[:n], [True] * n, [0] * n, food,
+                    blocked, 800, 600, 10, seed=seed)
+
+
+def test_move_drops_the_tail():
+    state = make_state([(40, 40), (50, 40), (60, 40)])
+    state.step(['UP'])
+    assert state.snakes[0] == [(50, 40), (60, 40), (60, 50)]
+    assert state.directions == ['UP']
+    assert state.alive == [True]
+
+
+def test_boundary_deaths():
+    for head, move in [((0, 40), 'LEFT'), ((790, 40), 'RIGHT'),
+                       ((40, 590), 'UP'), ((40, 0), 'DOWN')]:
+        state = make_state([head])
+        state.step([move])
+        assert state.alive == [False], (head, move)
+    # The last cell on each side is still inside
+    state = make_state([(780, 580)])
+    state.step(['RIGHT'])
+    assert state.alive == [True]
+
+
+def test_self_bite_and_obstacles():
+    state = make_state([(40, 40), (50, 40), (60, 40), (60, 50), (50, 50)],
+                       directions=('LEFT',))
+    state.step(['DOWN'])    # (50, 40) is part of the body
+    assert state.alive == [False]
+
+    # The tail moves on in the same tick, so following it is safe
+    state = make_state([(50, 50), (60, 50), (60, 60), (50, 60)], directions=('LEFT',))
+    state.step(['DOWN'])
+    assert state.alive == [True]
+
+    state = make_state([(40, 40)], blocked={(50, 40)})
+    state.step(['RIGHT'])
+    assert state.alive == [False]
+
+
+def test_food_scores_grows_and_respawns_on_the_grid():
+    state = make_state([(30, 40), (40, 40)], food=(50, 40))
+    state.step(['RIGHT'])
+    assert state.scores == [1]
+    # check_collision() grows by repeating the tail
+    assert state.snakes[0] == [(40, 40), (40, 40), (50, 40)]
+    fx, fy = state.food
+    assert fx % 10 == 0 and fy % 10 == 0
+    assert 10 <= fx < 800 and 10 <= fy < 600
+
+    # The grown tail only moves on after the next tick
+    state.step(['RIGHT'])
+    assert state.snakes[0] == [(40, 40), (50, 40), (60, 40)]
+
+
+def test_snake_collisions_kill_both():
+    # Head to head on the same cell
+    state = make_state([(40, 40)], [(60, 40)])
+    state.step(['RIGHT', 'LEFT'])
+    assert state.alive == [False, False]
+
+    # Head into the other snake's body
+    state = make_state([(40, 60)], [(30, 50), (40, 50), (50, 50)], directions=('UP', 'RIGHT'))
+    state.step(['DOWN', 'RIGHT'])
+    assert state.alive == [False, False]
+
+    # Both eat-or-die checks happen before the collision check, so a snake
+    # that hit the wall is out of it and the other survives
+    state = make_state([(0, 40)], [(20, 40)])
+    state.step(['LEFT', 'LEFT'])
+    assert state.alive == [False, True]
+    assert state.snakes[0] == [(-10, 40)]
+
+    # Dead snakes don't move
+    state.step([None, 'UP'])
+    assert state.snakes[0] == [(-10, 40)]
+    assert state.snakes[1] == [(10, 50)]
+
+
+def test_copy_is_independent_and_uses_the_given_rng():
+    state = make_state([(30, 40), (40, 40)], [(700, 500)], food=(50, 40))
+    rng = random.Random(7)
+    new = state.copy(rng)
+    assert new.rng is rng
+    assert state.copy().rng is state.rng
+    new.step(['RIGHT', 'LEFT'])
+    assert state.snakes == [[(30, 40), (40, 40)], [(700, 500)]]
+    assert state.scores == [0, 0] and state.food == (50, 40)
+    assert new.scores == [1, 0]
+    assert new.blocked is state.blocked
+
+
+def test_search_avoids_an_obvious_death():
+    # Heading right into the wall with a block below: only UP survives
+    state = make_state([(770, 300), (780, 300), (790, 300)], [(40, 40)],
+                       blocked={(790, 290)})
+    stats, rollouts = search(state, 0, 0.05, seed=3)
+    assert rollouts > 0
+    assert set(stats) == {'UP', 'DOWN', 'RIGHT'}
+    assert max(stats, key=lambda d: stats[d]) == 'UP'
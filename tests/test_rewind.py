@@ -0,0 +1,101 @@
+import copy
+import random
+
+import pytest
+
+from rewind import RewindBuffer
+
+
+def play(buffer, ticks, rng, state=None, history=None):
+    """
+    Drives a small fake game the way update() does (move, then maybe grow,
+    maybe change scalars or add an obstacle) and records every tick.
+    Returns {tick: deep copy of the recorded state} as the reference.
+    """
+    if state is None:
+        state = {
+            'snake1': [(40, 40)], 'snake2': [(760, 560)], 'obstacles_lines': [],
+            'food': (100, 100), 'scores': (0, 0), 'direction1': 'RIGHT',
+            'snake2_alive': True, 'time_passed': 0,
+        }
+        buffer.clear()
+        buffer.record(state)
+    history = {} if history is None else history
+    history[buffer.cursor] = copy.deepcopy(state)
+
+    for _ in range(ticks):
+        for key in ('snake1', 'snake2'):
+            snake = state[key]
+            if key == 'snake2' and not state['snake2_alive']:
+                continue
+            x, y = snake[-1]
+            dx, dy = rng.choice(((10, 0), (-10, 0), (0, 10), (0, -10)))
+            snake.append((x + dx, y + dy))
+            snake.pop(0)
+            if rng.random() < 0.1:
+                snake.insert(0, snake[0])
+        state['time_passed'] += 100
+        if rng.random() < 0.1:
+            state['food'] = (rng.randrange(80) * 10, rng.randrange(60) * 10)
+            state['scores'] = (state['scores'][0] + 1, state['scores'][1])
+        if rng.random() < 0.05:
+            state['direction1'] = rng.choice(('LEFT', 'RIGHT', 'UP', 'DOWN'))
+        if rng.random() < 0.01:
+            state['snake2_alive'] = False
+        if rng.random() < 0.03:
+            state['obstacles_lines'].append((rng.randrange(800), 1, rng.randrange(800), 1))
+        buffer.record(state)
+        history[buffer.cursor] = copy.deepcopy(state)
+    return history
+
+
+def test_seek_matches_full_copies():
+    buffer = RewindBuffer(capacity=300, keyframe_interval=16)
+    history = play(buffer, 1000, random.Random(1))
+
+    assert buffer.newest == 1000
+    assert buffer.oldest > 1000 - 300
+    for tick in range(buffer.oldest, buffer.newest + 1):
+        assert buffer.seek(tick) == history[tick]
+
+
+def test_ticks_outside_the_ring_are_rejected():
+    buffer = RewindBuffer(capacity=100, keyframe_interval=8)
+    play(buffer, 500, random.Random(2))
+
+    with pytest.raises(IndexError):
+        buffer.seek(buffer.oldest - 1)
+    with pytest.raises(IndexError):
+        buffer.seek(buffer.newest + 1)
+
+
+def test_resume_after_rewind_replaces_the_future():
+    rng = random.Random(3)
+    buffer = RewindBuffer(capacity=200, keyframe_interval=16)
+    history = play(buffer, 400, rng)
+
+    state = buffer.seek(350)
+    history = {t: s for t, s in history.items() if t <= 350}
+    play(buffer, 30, rng, state=state, history=history)
+
+    assert buffer.newest == 380
+    # Slots overwritten by the discarded ticks 381..400 are no longer seekable
+    assert buffer.oldest > 400 - 200
+    for tick in range(buffer.oldest, buffer.newest + 1):
+        assert buffer.seek(tick) == history[tick]
+
+
+def test_scrubbing_forward_keeps_history_until_next_record():
+    buffer = RewindBuffer(capacity=100)
+    history = play(buffer, 80, random.Random(4))
+
+    buffer.seek(10)
+    assert buffer.seek(80) == history[80]
+
+
+def test_shrinking_snake_requires_clear():
+    buffer = RewindBuffer(capacity=10)
+    state = {'snake1': [(0, 0), (10, 0)], 'snake2': [(50, 50)], 'obstacles_lines': []}
+    buffer.record(state)
+    with pytest.raises(ValueError):
+        buffer.record(dict(state, snake1=[(20, 0)]))